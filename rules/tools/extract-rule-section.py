@@ -7,128 +7,347 @@ Usage:
     python extract-rule-section.py <rule-file> <section-name>
     python extract-rule-section.py typescript-test-naming.md requirements
     python extract-rule-section.py --json typescript-test-naming.md all
+    python extract-rule-section.py --compact typescript-test-naming.md all
+    python extract-rule-section.py --no-cache --json typescript-test-naming.md all
+
+`--json all` output is cached under $XDG_CACHE_HOME/workflow-tools/rules
+(default ~/.cache), keyed by the rule's content; --no-cache bypasses it.
 """
 
+import os
 import sys
 import re
 import json
-import yaml
+import shutil
+import functools
+import hashlib
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
+
+
+# PyYAML is imported on first use; many lookups never touch front matter
+_yaml = None
+_yaml_loader = None
+
+
+def _get_yaml():
+    """Import PyYAML lazily, preferring the libyaml-backed safe loader."""
+    global _yaml, _yaml_loader
+    if _yaml is None:
+        import yaml
+        try:
+            from yaml import CSafeLoader as loader
+        except ImportError:
+            from yaml import SafeLoader as loader
+        _yaml, _yaml_loader = yaml, loader
+    return _yaml, _yaml_loader
+
+
+def _parse_front_matter(content: str) -> Dict:
+    """Parse YAML front matter from rule content."""
+    if content.startswith('---'):
+        end_marker = content.find('---', 3)
+        if end_marker != -1:
+            yaml_content = content[3:end_marker]
+            yaml, loader = _get_yaml()
+            return yaml.load(yaml_content, Loader=loader)
+    return {}
+
+
+def _decode_rule(data: bytes) -> str:
+    """Decode rule bytes with universal newlines, as read_text() would.
+    
+    Newline translation is only paid for files that contain carriage returns.
+    """
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+@functools.lru_cache(maxsize=128)
+def _load_rule(path_str: str, mtime_ns: int, size: int, max_chars: Optional[int]) -> str:
+    """Read a rule file, or only its first max_chars characters.
+    
+    Keyed on stat info so edits invalidate the entry.
+    """
+    if max_chars is None:
+        return _decode_rule(Path(path_str).read_bytes())
+    with open(path_str, encoding='utf-8') as f:
+        return f.read(max_chars)
+
+
+@functools.lru_cache(maxsize=128)
+def _load_metadata(path_str: str, mtime_ns: int, size: int, max_chars: Optional[int]) -> Dict:
+    """Parse a rule file's front matter, keyed like _load_rule."""
+    return _parse_front_matter(_load_rule(path_str, mtime_ns, size, max_chars))
+
+
+@functools.lru_cache(maxsize=128)
+def _extract_all(path_str: str, mtime_ns: int, size: int,
+                 max_chars: Optional[int]) -> Dict[str, Union[Dict, List, str]]:
+    """Cached full extraction, keyed like _load_rule."""
+    return RuleExtractor(Path(path_str), max_chars)._extract_all_uncached()
 
 
 class RuleExtractor:
-    """Extracts sections from LLM-optimized rule files."""
+    """Extracts sections from LLM-optimized rule files.
+    
+    Parsed content and extract_all() results are shared between instances
+    for the same unchanged file, so returned structures should be treated
+    as read-only.
+    """
     
-    def __init__(self, rule_file: Path):
+    _ITEM_RE = re.compile(r'\*\*\[(\w+)\]\*\* (.*?)(?=\n\d+\.|\Z)', re.DOTALL)
+    _FIELD_RE = re.compile(r'\n[ \t]*- (Rationale|Impact|Why|Instead): ')
+    _REQ_FIELDS = {'Rationale': 'rationale', 'Impact': 'impact'}
+    _ANT_FIELDS = {'Why': 'why', 'Instead': 'instead'}
+    _PATTERN_HEAD_RE = re.compile(r'- \*\*(PATTERN_(GOOD|BAD)_\d+)\*\*: `(.+?)`')
+    _PATTERN_FIELDS = (
+        ('  - Example: ', 'example'),
+        ('  - Matches: ', 'matches'),
+        ('  - Avoid because: ', 'avoid_because')
+    )
+    _EXAMPLE_RE = re.compile(
+        r'### (?P<kind>[A-Z]+)_EXAMPLE_(\d+): (.*?)\n```(\w+)\n(.*?)```\n\*\*Why this is (?i:(?P=kind))\*\*: (.*?)(?=###|\Z)',
+        re.DOTALL
+    )
+    # Zero-width at every '##'-prefixed line start, or an EXTRACT start marker
+    _TOKEN_RE = re.compile(r'^(?=##)|<!-- EXTRACT:(\S+?):start -->', re.MULTILINE)
+    
+    def __init__(self, rule_file: Path, max_chars: Optional[int] = None):
+        """Load a rule file, optionally reading only its first max_chars characters."""
         self.rule_file = rule_file
-        self.content = rule_file.read_text()
-        self.metadata = self._extract_metadata()
-        
-    def _extract_metadata(self) -> Dict:
-        """Extract YAML front matter."""
-        if self.content.startswith('---'):
-            end_marker = self.content.find('---', 3)
-            if end_marker != -1:
-                yaml_content = self.content[3:end_marker]
-                return yaml.safe_load(yaml_content)
-        return {}
+        stat = rule_file.stat()
+        self._cache_key = (str(rule_file), stat.st_mtime_ns, stat.st_size, max_chars)
+        self.content = _load_rule(*self._cache_key)
+    
+    @functools.cached_property
+    def _parsed(self) -> Dict[str, Union[Dict, List]]:
+        """Walk the content once, indexing headings, EXTRACT markers and examples.
+        
+        'sections' and 'markers' map names to (body_start, body_end) offsets;
+        'examples' lists the offsets of '### *_EXAMPLE_*' headings. A section
+        body runs until the next line starting with '##' (any heading level),
+        and the first section or marker with a given name wins.
+        """
+        content = self.content
+        sections = {}
+        markers = {}
+        examples = []
+        pending = None  # (name, body_start) of the open '## ' section
+        
+        for token in self._TOKEN_RE.finditer(content):
+            name = token.group(1)
+            if name is not None:
+                if name not in markers:
+                    end = content.find(f'<!-- EXTRACT:{name}:end -->', token.end())
+                    if end != -1:
+                        markers[name] = (token.end(), end)
+                continue
+            
+            start = token.start()
+            if pending is not None:
+                sections.setdefault(pending[0], (pending[1], start))
+                pending = None
+            
+            # Headings without a trailing newline have no body
+            line_end = content.find('\n', start)
+            if line_end == -1:
+                continue
+            line = content[start:line_end]
+            if line.startswith('## '):
+                pending = (line[3:], line_end + 1)
+            elif line.startswith('### ') and '_EXAMPLE_' in line:
+                examples.append(start)
+        
+        if pending is not None:
+            sections.setdefault(pending[0], (pending[1], len(content)))
+        
+        return {'sections': sections, 'markers': markers, 'examples': examples}
+    
+    @functools.cached_property
+    def metadata(self) -> Dict:
+        """YAML front matter, parsed on first access."""
+        return _load_metadata(*self._cache_key)
+    
+    @functools.cached_property
+    def body_hash(self) -> str:
+        """Hash of the markdown body, ignoring front matter.
+        
+        Stable across metadata-only edits (e.g. last_updated bumps), so it
+        makes a better cache key for extracted sections than the file hash.
+        """
+        body = self.content
+        if body.startswith('---'):
+            end = body.find('\n---', 3)
+            if end != -1:
+                body = body[end + 4:]
+        return hashlib.blake2b(body.encode(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def clear_cache():
+        """Drop all cached rule content and extraction results."""
+        _load_rule.cache_clear()
+        _load_metadata.cache_clear()
+        _extract_all.cache_clear()
     
     def extract_section(self, section_name: str) -> Optional[str]:
         """Extract a specific section by name."""
-        # Check for extraction markers first
-        marker_pattern = rf'<!-- EXTRACT:{section_name}:start -->(.*?)<!-- EXTRACT:{section_name}:end -->'
-        match = re.search(marker_pattern, self.content, re.DOTALL)
-        if match:
-            return match.group(1).strip()
-        
-        # Check for CAPS_SECTION_NAME
-        section_name_upper = section_name.upper().replace('-', '_')
-        section_pattern = rf'^## {section_name_upper}\n(.*?)(?=^##|\Z)'
-        match = re.search(section_pattern, self.content, re.MULTILINE | re.DOTALL)
-        if match:
-            return match.group(1).strip()
+        # Check for extraction markers first, then CAPS_SECTION_NAME
+        span = self._parsed['markers'].get(section_name)
+        if span is None:
+            span = self._parsed['sections'].get(section_name.upper().replace('-', '_'))
+        if span is not None:
+            return self.content[span[0]:span[1]].strip()
         
         return None
     
+    @staticmethod
+    def _example_from_match(match: re.Match) -> Dict[str, str]:
+        """Build an example dict from an _EXAMPLE_RE match."""
+        return {
+            'id': f"{match.group('kind')}_EXAMPLE_{match.group(2)}",
+            'title': match.group(3),
+            'language': match.group(4),
+            'code': match.group(5).strip(),
+            'explanation': match.group(6).strip()
+        }
+    
+    def _iter_example_matches(self) -> Iterator[re.Match]:
+        """Match _EXAMPLE_RE only at indexed example headings, without overlaps."""
+        last_end = 0
+        for start in self._parsed['examples']:
+            if start < last_end:
+                continue
+            match = self._EXAMPLE_RE.match(self.content, start)
+            if match:
+                last_end = match.end()
+                yield match
+    
+    @functools.cached_property
+    def _examples_by_type(self) -> Dict[str, List[Dict[str, str]]]:
+        """All examples in one scan, bucketed by lower-case type ('good', 'bad', ...)."""
+        examples = {}
+        for match in self._iter_example_matches():
+            examples.setdefault(match.group('kind').lower(), []).append(self._example_from_match(match))
+        return examples
+    
+    def iter_examples(self, example_type: str = 'good') -> Iterator[Dict[str, str]]:
+        """Yield examples of a specific type, scanning lazily until one is fully indexed."""
+        example_type = example_type.lower()
+        if '_examples_by_type' in self.__dict__:
+            yield from self._examples_by_type.get(example_type, [])
+            return
+        
+        for match in self._iter_example_matches():
+            if match.group('kind').lower() == example_type:
+                yield self._example_from_match(match)
+    
     def extract_examples(self, example_type: str = 'good') -> List[Dict[str, str]]:
         """Extract all examples of a specific type."""
-        examples = []
-        pattern = rf'### {example_type.upper()}_EXAMPLE_(\d+): (.*?)\n```(\w+)\n(.*?)```\n\*\*Why this is {example_type}\*\*: (.*?)(?=###|\Z)'
+        return list(self._examples_by_type.get(example_type.lower(), []))
+    
+    def _iter_items(self, section: Optional[str], text_key: str,
+                    fields: Dict[str, str]) -> Iterator[Dict[str, str]]:
+        """Yield numbered **[ID]** items and their labelled sub-bullets one at a time.
         
-        for match in re.finditer(pattern, self.content, re.DOTALL):
-            examples.append({
-                'id': f'{example_type.upper()}_EXAMPLE_{match.group(1)}',
-                'title': match.group(2),
-                'language': match.group(3),
-                'code': match.group(4).strip(),
-                'explanation': match.group(5).strip()
-            })
+        fields maps bullet labels (e.g. 'Rationale') to output keys; each
+        value runs until the next recognised label or the end of the item.
+        """
+        if not section:
+            return
         
-        return examples
+        for match in self._ITEM_RE.finditer(section):
+            body = match.group(2)
+            cuts = [m for m in self._FIELD_RE.finditer(body) if m.group(1) in fields]
+            
+            item = {'id': match.group(1), text_key: body[:cuts[0].start() if cuts else len(body)].strip()}
+            item.update(dict.fromkeys(fields.values()))
+            for i, cut in enumerate(cuts):
+                end = cuts[i + 1].start() if i + 1 < len(cuts) else len(body)
+                value = body[cut.end():end]
+                item[fields[cut.group(1)]] = value.strip() if value else None
+            yield item
     
-    def extract_requirements(self) -> List[Dict[str, str]]:
-        """Extract all requirements (REQ*)."""
-        requirements = []
+    def iter_requirements(self) -> Iterator[Dict[str, str]]:
+        """Yield requirements (REQ*) lazily, so callers can stop early."""
         req_section = self.extract_section('requirements')
         if not req_section:
             req_section = self.extract_section('MUST_FOLLOW')
         
-        if req_section:
-            pattern = r'\*\*\[(\w+)\]\*\* (.*?)(?:\n   - Rationale: (.*?))?(?:\n   - Impact: (.*?))?(?=\n\d+\.|\Z)'
-            for match in re.finditer(pattern, req_section, re.DOTALL):
-                requirements.append({
-                    'id': match.group(1),
-                    'requirement': match.group(2).strip(),
-                    'rationale': match.group(3).strip() if match.group(3) else None,
-                    'impact': match.group(4).strip() if match.group(4) else None
-                })
-        
-        return requirements
+        return self._iter_items(req_section, 'requirement', self._REQ_FIELDS)
     
-    def extract_antipatterns(self) -> List[Dict[str, str]]:
-        """Extract all anti-patterns (ANT*)."""
-        antipatterns = []
+    def iter_antipatterns(self) -> Iterator[Dict[str, str]]:
+        """Yield anti-patterns (ANT*) lazily, so callers can stop early."""
         ant_section = self.extract_section('antipatterns')
         if not ant_section:
             ant_section = self.extract_section('MUST_NOT_DO')
         
-        if ant_section:
-            pattern = r'\*\*\[(\w+)\]\*\* (.*?)(?:\n   - Why: (.*?))?(?:\n   - Instead: (.*?))?(?=\n\d+\.|\Z)'
-            for match in re.finditer(pattern, ant_section, re.DOTALL):
-                antipatterns.append({
-                    'id': match.group(1),
-                    'antipattern': match.group(2).strip(),
-                    'why': match.group(3).strip() if match.group(3) else None,
-                    'instead': match.group(4).strip() if match.group(4) else None
-                })
-        
-        return antipatterns
+        return self._iter_items(ant_section, 'antipattern', self._ANT_FIELDS)
+    
+    @functools.cached_property
+    def _requirements(self) -> List[Dict[str, str]]:
+        """All requirements, parsed once per instance."""
+        return list(self.iter_requirements())
+    
+    @functools.cached_property
+    def _antipatterns(self) -> List[Dict[str, str]]:
+        """All anti-patterns, parsed once per instance."""
+        return list(self.iter_antipatterns())
+    
+    def extract_requirements(self) -> List[Dict[str, str]]:
+        """Extract all requirements (REQ*)."""
+        return list(self._requirements)
+    
+    def extract_antipatterns(self) -> List[Dict[str, str]]:
+        """Extract all anti-patterns (ANT*)."""
+        return list(self._antipatterns)
     
     def extract_patterns(self) -> Dict[str, List[Dict[str, str]]]:
-        """Extract pattern matching rules."""
+        """Extract pattern matching rules.
+        
+        Line-oriented: a '- **PATTERN_*' line opens a pattern and the
+        '  - Label: value' bullets directly below it fill in its fields.
+        """
         patterns = {'good': [], 'bad': []}
         pattern_section = self.extract_section('patterns')
+        if not pattern_section:
+            return patterns
         
-        if pattern_section:
-            pattern_regex = r'- \*\*(PATTERN_(GOOD|BAD)_\d+)\*\*: `(.*?)`(?:\n  - Example: (.*?))?(?:\n  - Matches: (.*?))?(?:\n  - Avoid because: (.*?))?'
-            
-            for match in re.finditer(pattern_regex, pattern_section, re.DOTALL):
-                pattern_type = 'good' if match.group(2) == 'GOOD' else 'bad'
-                pattern_data = {
-                    'id': match.group(1),
-                    'pattern': match.group(3),
-                    'example': match.group(4).strip() if match.group(4) else None,
-                    'matches': match.group(5).strip() if match.group(5) else None
+        current = None
+        for line in pattern_section.split('\n'):
+            head = self._PATTERN_HEAD_RE.match(line.lstrip())
+            if head:
+                pattern_type = 'good' if head.group(2) == 'GOOD' else 'bad'
+                current = {
+                    'id': head.group(1),
+                    'pattern': head.group(3),
+                    'example': None,
+                    'matches': None
                 }
-                if pattern_type == 'bad' and match.group(6):
-                    pattern_data['avoid_because'] = match.group(6).strip()
-                patterns[pattern_type].append(pattern_data)
+                patterns[pattern_type].append(current)
+                continue
+            
+            if current is None or not line.startswith('  - '):
+                current = None
+                continue
+            
+            for prefix, key in self._PATTERN_FIELDS:
+                if line.startswith(prefix):
+                    # Only bad patterns explain what to avoid
+                    if key != 'avoid_because' or current['id'].startswith('PATTERN_BAD'):
+                        current[key] = line[len(prefix):].strip()
+                    break
         
         return patterns
     
     def extract_all(self) -> Dict[str, Union[Dict, List, str]]:
         """Extract all sections and metadata."""
+        return _extract_all(*self._cache_key)
+    
+    def _extract_all_uncached(self) -> Dict[str, Union[Dict, List, str]]:
+        """Build the extract_all() result from scratch."""
         return {
             'metadata': self.metadata,
             'rule_summary': self.extract_section('RULE_SUMMARY'),
@@ -142,19 +361,67 @@ class RuleExtractor:
         }
 
 
+def write_json(data, compact: bool = False, fp=None):
+    """Stream JSON to fp (stdout by default) instead of building the whole string first.
+    
+    Non-JSON values from front matter, such as YAML dates, are written as strings.
+    """
+    fp = fp or sys.stdout
+    if compact:
+        json.dump(data, fp, separators=(',', ':'), default=str)
+    else:
+        json.dump(data, fp, indent=2, default=str)
+    fp.write('\n')
+
+
+def _output_cache_file(rule_file: Path, compact: bool) -> Path:
+    """Cache location for a rule's `--json all` output, keyed by its content."""
+    digest = hashlib.blake2b(rule_file.read_bytes(), digest_size=16)
+    # Extractor changes alter the output, so they invalidate the cache too
+    digest.update(str(Path(__file__).stat().st_mtime_ns).encode())
+    
+    cache_dir = Path(os.environ.get('XDG_CACHE_HOME', '~/.cache')).expanduser() / 'workflow-tools' / 'rules'
+    suffix = '.compact.json' if compact else '.json'
+    return cache_dir / f'{digest.hexdigest()}{suffix}'
+
+
+def _write_output_cache(rule_file: Path, cache_file: Path, compact: bool):
+    """Extract everything and write the JSON output to cache_file atomically."""
+    result = RuleExtractor(rule_file).extract_all()
+    
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f'{cache_file.name}.{os.getpid()}.tmp')
+    try:
+        with tmp_file.open('w') as f:
+            write_json(result, compact, f)
+        os.replace(tmp_file, cache_file)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+
 def main():
     """Command-line interface."""
     if len(sys.argv) < 3:
         print(__doc__)
         sys.exit(1)
     
-    # Parse arguments
+    # Parse arguments (--compact implies --json)
     output_json = False
+    compact = False
+    use_cache = True
     args = sys.argv[1:]
-    if args[0] == '--json':
-        output_json = True
+    while args and args[0] in ('--json', '--compact', '--no-cache'):
+        if args[0] == '--no-cache':
+            use_cache = False
+        else:
+            output_json = True
+            compact = compact or args[0] == '--compact'
         args = args[1:]
     
+    if len(args) < 2:
+        print(__doc__)
+        sys.exit(1)
+    
     rule_file = Path(args[0])
     section_name = args[1]
     
@@ -162,12 +429,26 @@ def main():
         print(f"Error: Rule file '{rule_file}' not found")
         sys.exit(1)
     
+    # Serve `--json all` from the on-disk cache, filling it on a miss
+    if section_name == 'all' and output_json and use_cache:
+        cache_file = _output_cache_file(rule_file, compact)
+        try:
+            if not cache_file.exists():
+                _write_output_cache(rule_file, cache_file, compact)
+        except OSError:
+            pass  # unwritable cache directory; fall through to direct output
+        else:
+            sys.stdout.flush()
+            with cache_file.open('rb') as f:
+                shutil.copyfileobj(f, sys.stdout.buffer)
+            return
+    
     extractor = RuleExtractor(rule_file)
     
     if section_name == 'all':
         result = extractor.extract_all()
         if output_json:
-            print(json.dumps(result, indent=2))
+            write_json(result, compact)
         else:
             for key, value in result.items():
                 if value:
@@ -195,7 +476,7 @@ def main():
         
         if result:
             if output_json and isinstance(result, (dict, list)):
-                print(json.dumps(result, indent=2))
+                write_json(result, compact)
             else:
                 print(result)
         else:
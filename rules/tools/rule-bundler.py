@@ -8,32 +8,332 @@ Usage:
     python rule-bundler.py --language typescript --sections requirements,antipatterns
     python rule-bundler.py --bundle test-setup --output bundle.json
     python rule-bundler.py --create-bundle "typescript-testing" rule1.md rule2.md
+
+Bundle JSON is written compact; add --pretty for indented output.
 """
 
 import sys
+import os
 import json
 import yaml
+import functools
+import hashlib
+import operator
+import pickle
+import shutil
+import struct
+import zlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Tuple
 import re
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json produces the same bytes
+    orjson = None
+
+RULES_DIR = Path(__file__).parent.parent
+
+# Substrings of a task description that signal each language / category
+LANGUAGE_PATTERNS = {
+    'typescript': ['typescript', 'ts', 'tsx'],
+    'javascript': ['javascript', 'js', 'jsx'],
+    'python': ['python', 'py'],
+    'csharp': ['c#', 'csharp', 'dotnet', '.net'],
+    'go': ['go', 'golang'],
+    'java': ['java'],
+    'ruby': ['ruby', 'rb']
+}
+
+CATEGORY_PATTERNS = {
+    'test-naming': ['test', 'testing', 'spec', 'unit test'],
+    'code-quality': ['quality', 'clean code', 'refactor', 'code review'],
+    'security': ['security', 'secure', 'vulnerability', 'owasp'],
+    'git-workflow': ['git', 'commit', 'branch', 'pull request', 'pr']
+}
+
+# Whole words that signal each action, checked in order
+_ACTION_MAP = {
+    'review': frozenset({'review', 'check', 'validate', 'audit'}),
+    'generate': frozenset({'generate', 'create', 'write', 'implement'}),
+    'fix': frozenset({'fix', 'repair', 'correct', 'update'}),
+    'learn': frozenset({'learn', 'understand', 'explain'})
+}
+
+# Letter runs in the lower-cased task, so "react18" and "user_data" yield "react", "user", "data";
+# runs of 4+ letters are the keywords
+_WORD_RE = re.compile(r'[a-z]+')
+_STOPWORDS = frozenset({'that', 'this', 'with', 'from', 'have'})
+# Word runs in a tag long enough to contain a keyword
+_TAG_WORD_RE = re.compile(r'\w{4,}')
+
+# Requested section name -> (bundle section key, RuleExtractor call that produces it)
+_SECTION_DISPATCH = {
+    'RULE_SUMMARY': ('summary', operator.methodcaller('extract_section', 'RULE_SUMMARY')),
+    'requirements': ('requirements', operator.methodcaller('extract_requirements')),
+    'MUST_FOLLOW': ('requirements', operator.methodcaller('extract_requirements')),
+    'antipatterns': ('antipatterns', operator.methodcaller('extract_antipatterns')),
+    'MUST_NOT_DO': ('antipatterns', operator.methodcaller('extract_antipatterns')),
+    'good_examples': ('good_examples', operator.methodcaller('extract_examples', 'good')),
+    'CONTEXT_AND_RATIONALE': ('context', operator.methodcaller('extract_section', 'CONTEXT_AND_RATIONALE'))
+}
+
+# Bundle section key -> RuleExtractor call that produces it
+_SECTION_EXTRACTORS = dict(_SECTION_DISPATCH.values())
+
+# Section cache file layout: magic, version, hash length, inputs hash, zlib(pickle(sections))
+_CACHE_MAGIC = b'rbnd'
+_CACHE_VERSION = 2
+_CACHE_HEADER = struct.Struct('<4sII')
+
+# Sources whose code shapes cached output: this module and the extractor it imports
+_CODE_PATHS = (Path(__file__), Path(__file__).with_name('extract-rule-section.py'))
+
+
+def _compile_patterns(groups: Dict[str, List[str]]) -> Tuple[re.Pattern, Dict[str, Set[str]]]:
+    """Compile substring patterns into one alternation plus a match -> keys map.
+    
+    The lookahead tries every position, and each token maps to every key with a
+    pattern inside it, so results equal a plain substring test per pattern.
+    """
+    tokens = sorted({p for patterns in groups.values() for p in patterns}, key=len, reverse=True)
+    owners = {
+        token: {key for key, patterns in groups.items() if any(p in token for p in patterns)}
+        for token in tokens
+    }
+    regex = re.compile('(?=(' + '|'.join(map(re.escape, tokens)) + '))')
+    return regex, owners
+
+
+def _code_stamp() -> str:
+    """mtimes of the bundler and extractor sources; editing either invalidates cached output."""
+    stamps = []
+    for path in _CODE_PATHS:
+        try:
+            stamps.append(str(path.stat().st_mtime_ns))
+        except FileNotFoundError:
+            stamps.append('missing')
+    return ':'.join(stamps)
+
+
+def _dumps(obj, pretty: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON, compact unless pretty is set."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def _write_json(path: Path, obj, pretty: bool = False):
+    """Write obj to path as the bytes _dumps would produce, without an extra full copy.
+    
+    orjson's single buffer goes straight to the file; stdlib json streams
+    its chunks instead of building the whole string and then its bytes.
+    """
+    if orjson is not None:
+        with path.open('wb') as f:
+            f.write(_dumps(obj, pretty))
+        return
+    
+    with path.open('w', encoding='utf-8', newline='') as f:
+        if pretty:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+        else:
+            json.dump(obj, f, separators=(',', ':'), ensure_ascii=False)
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _size_of(obj) -> int:
+    """Length of obj's compact JSON encoding in bytes."""
+    if orjson is not None:
+        return len(orjson.dumps(obj))
+    text = json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+    # ASCII text is already its byte length; only other text needs encoding to count
+    return len(text) if text.isascii() else len(text.encode())
+
+
+def _entry_size(key: str, value, entries: int) -> int:
+    """Bytes that dropping key would remove from the compact JSON of a dict of entries items.
+    
+    Counts the key, its ':' separator and value, plus the ',' between
+    entries when other entries remain.
+    """
+    return _size_of(key) + 1 + _size_of(value) + (1 if entries > 1 else 0)
+
+
+def _replace_sections(bundle: Dict, pick) -> Dict:
+    """Copy of bundle with each rule's sections replaced by pick(rule_id, sections)."""
+    rules = {
+        rule_id: {**rule_data, 'sections': pick(rule_id, rule_data['sections'])}
+        for rule_id, rule_data in bundle['rules'].items()
+    }
+    return {**bundle, 'rules': rules}
+
+
+@functools.lru_cache(maxsize=512)
+def _get_extractor(path_str: str, mtime_ns: int):
+    """Shared RuleExtractor per rule file; mtime_ns keys out stale entries."""
+    from extract_rule_section import RuleExtractor
+    
+    return RuleExtractor(Path(path_str))
+
+
+def _extract_sections(path_str: str, mtime_ns: int, keys: Tuple[str, ...]) -> Dict:
+    """The given bundle sections of a rule file."""
+    extractor = _get_extractor(path_str, mtime_ns)
+    return {key: _SECTION_EXTRACTORS[key](extractor) for key in keys}
+
 
 class RuleBundler:
     """Bundle rules for efficient LLM consumption."""
     
+    __slots__ = (
+        'rules_dir', 'rules_index', '_bundles_dir',
+        '_rule_ids', '_by_language', '_by_category', '_tag_index', '_by_filename',
+        '_lang_re', '_lang_owners', '_cat_re', '_cat_owners',
+        '_cache_path', '_section_cache', '_content_cache', '_cache_dirty'
+    )
+    
     def __init__(self):
-        self.rules_dir = Path(__file__).parent.parent
+        self.rules_dir = RULES_DIR
         self.rules_index = self._load_rules_index()
-        self.bundles_dir = self.rules_dir / 'bundles'
-        self.bundles_dir.mkdir(exist_ok=True)
-        
+        self._index_rules()
+        self._bundles_dir = None  # created on first use, so read-only runs never touch it
+        self._lang_re, self._lang_owners = _compile_patterns(LANGUAGE_PATTERNS)
+        self._cat_re, self._cat_owners = _compile_patterns(CATEGORY_PATTERNS)
+        self._cache_path = self.rules_dir / '.bundler-cache.bin'
+        self._section_cache = None  # rule_id -> (file key, body hash, sections), loaded on first use
+        self._content_cache = {}  # body hash -> sections
+        self._cache_dirty = False
+        
+    @property
+    def bundles_dir(self) -> Path:
+        """Directory for saved bundles, created the first time it is needed."""
+        if self._bundles_dir is None:
+            self._bundles_dir = self.rules_dir / 'bundles'
+            self._bundles_dir.mkdir(exist_ok=True)
+        return self._bundles_dir
+    
     def _load_rules_index(self) -> Dict:
         """Load the rules index."""
         index_path = self.rules_dir / 'rules-index.json'
         if index_path.exists():
-            return json.loads(index_path.read_text())
+            return _loads(index_path.read_bytes())
         return {'rules': {}}
     
+    def _index_rules(self):
+        """Build the filename lookup and the language, category and tag bitsets for selection.
+        
+        Bit i of every mask stands for the i-th rule in the index. Keywords
+        matched tags by substring, so every 4+ character substring of a
+        tag's word runs is indexed to keep exactly those matches.
+        """
+        self._rule_ids = list(self.rules_index['rules'])
+        self._by_language = defaultdict(int)
+        self._by_category = defaultdict(int)
+        self._tag_index = defaultdict(int)
+        self._by_filename = {}
+        
+        for bit, (rule_id, rule) in enumerate(self.rules_index['rules'].items()):
+            if 'file_path' in rule:
+                self._by_filename.setdefault(Path(rule['file_path']).name, rule_id)
+            
+            mask = 1 << bit
+            self._by_language[rule.get('language')] |= mask
+            self._by_category[rule.get('category')] |= mask
+            for tag in rule.get('tags', []):
+                for word in _TAG_WORD_RE.findall(tag.lower()):
+                    for start in range(len(word) - 3):
+                        for end in range(start + 4, len(word) + 1):
+                            self._tag_index[word[start:end]] |= mask
+    
+    def _cache_hash(self) -> bytes:
+        """Hash of the rules index stat info and the tool code; a change to either invalidates the cache."""
+        try:
+            stat = (self.rules_dir / 'rules-index.json').stat()
+            index_stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+        except FileNotFoundError:
+            index_stamp = 'missing'
+        return hashlib.sha256(f"{index_stamp}:{_code_stamp()}".encode()).digest()
+    
+    def _load_section_cache(self) -> Dict:
+        """Read the on-disk section cache; empty if missing, stale or unreadable."""
+        try:
+            data = self._cache_path.read_bytes()
+            magic, version, hash_len = _CACHE_HEADER.unpack_from(data)
+            start = _CACHE_HEADER.size
+            if (magic == _CACHE_MAGIC and version == _CACHE_VERSION
+                    and data[start:start + hash_len] == self._cache_hash()):
+                return pickle.loads(zlib.decompress(data[start + hash_len:]))
+        except (OSError, ValueError, EOFError, struct.error, zlib.error, pickle.UnpicklingError):
+            pass
+        return {}
+    
+    def _save_section_cache(self):
+        """Atomically write the section cache; skipped on a read-only checkout."""
+        digest = self._cache_hash()
+        payload = zlib.compress(pickle.dumps(self._section_cache, pickle.HIGHEST_PROTOCOL))
+        # Per-process name, so concurrent runs never write into each other's file
+        tmp_path = self._cache_path.with_name(f'{self._cache_path.name}.{os.getpid()}.tmp')
+        try:
+            tmp_path.write_bytes(
+                _CACHE_HEADER.pack(_CACHE_MAGIC, _CACHE_VERSION, len(digest)) + digest + payload)
+            os.replace(tmp_path, self._cache_path)
+        except OSError:
+            pass
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self._cache_dirty = False
+    
+    def _load_sections(self, paths: Dict[str, Path], keys: Tuple[str, ...]) -> Dict[str, Dict]:
+        """Sections of several rules, extracting the requested keys they lack in parallel.
+        
+        Sections are shared by markdown body, so a file whose stat info
+        changed but whose body didn't (a touch, a fresh checkout or a
+        front-matter-only edit) reuses the sections cached for that body.
+        The returned dicts hold at least keys, plus any other cached sections.
+        """
+        if self._section_cache is None:
+            self._section_cache = self._load_section_cache()
+            self._content_cache = {digest: sections for _, digest, sections in self._section_cache.values()}
+        
+        entries = {}
+        for rule_id, rule_path in paths.items():
+            stat = rule_path.stat()
+            file_key = (str(rule_path), stat.st_mtime_ns, stat.st_size)
+            entry = self._section_cache.get(rule_id)
+            if entry is None or entry[0] != file_key:
+                digest = _get_extractor(file_key[0], file_key[1]).body_hash
+                entry = (file_key, digest, self._content_cache.setdefault(digest, {}))
+                self._section_cache[rule_id] = entry
+                self._cache_dirty = True
+            entries[rule_id] = entry
+        
+        # Each distinct content once, with only the sections it still lacks
+        misses = {}
+        for file_key, digest, sections in entries.values():
+            missing = tuple(key for key in keys if key not in sections)
+            if missing and digest not in misses:
+                misses[digest] = (file_key, sections, missing)
+        
+        # Rule files are independent, so overlap their reads and parsing
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(16, len(misses))) as executor:
+                extracted = executor.map(
+                    lambda miss: _extract_sections(miss[0][0], miss[0][1], miss[2]), misses.values())
+                for (_, sections, _), values in zip(misses.values(), extracted):
+                    sections.update(values)
+            self._cache_dirty = True
+        
+        return {rule_id: entry[2] for rule_id, entry in entries.items()}
+    
     def bundle_for_task(self, task_description: str) -> Dict:
         """Create an optimized bundle based on task description."""
         # Extract keywords and determine context
@@ -61,6 +361,7 @@ class RuleBundler:
     def _analyze_task(self, task: str) -> Dict:
         """Analyze task to determine context."""
         task_lower = task.lower()
+        words = dict.fromkeys(_WORD_RE.findall(task_lower))
         
         context = {
             'action': 'unknown',
@@ -69,75 +370,57 @@ class RuleBundler:
             'keywords': []
         }
         
-        # Determine action
-        if any(word in task_lower for word in ['review', 'check', 'validate', 'audit']):
-            context['action'] = 'review'
-        elif any(word in task_lower for word in ['generate', 'create', 'write', 'implement']):
-            context['action'] = 'generate'
-        elif any(word in task_lower for word in ['fix', 'repair', 'correct', 'update']):
-            context['action'] = 'fix'
-        elif any(word in task_lower for word in ['learn', 'understand', 'explain']):
-            context['action'] = 'learn'
-        
-        # Detect languages
-        language_patterns = {
-            'typescript': ['typescript', 'ts', 'tsx'],
-            'javascript': ['javascript', 'js', 'jsx'],
-            'python': ['python', 'py'],
-            'csharp': ['c#', 'csharp', 'dotnet', '.net'],
-            'go': ['go', 'golang'],
-            'java': ['java'],
-            'ruby': ['ruby', 'rb']
-        }
-        
-        for lang, patterns in language_patterns.items():
-            if any(p in task_lower for p in patterns):
-                context['languages'].append(lang)
-        
-        # Detect categories
-        category_patterns = {
-            'test-naming': ['test', 'testing', 'spec', 'unit test'],
-            'code-quality': ['quality', 'clean code', 'refactor', 'code review'],
-            'security': ['security', 'secure', 'vulnerability', 'owasp'],
-            'git-workflow': ['git', 'commit', 'branch', 'pull request', 'pr']
-        }
+        # Determine action from whole words, so "overview" isn't a review
+        context['action'] = next(
+            (action for action, triggers in _ACTION_MAP.items() if not triggers.isdisjoint(words)),
+            'unknown'
+        )
         
-        for cat, patterns in category_patterns.items():
-            if any(p in task_lower for p in patterns):
-                context['categories'].append(cat)
+        # Detect languages and categories in one sweep each
+        context['languages'] = self._match_keys(
+            self._lang_re, self._lang_owners, LANGUAGE_PATTERNS, task_lower)
+        context['categories'] = self._match_keys(
+            self._cat_re, self._cat_owners, CATEGORY_PATTERNS, task_lower)
         
-        # Extract keywords
-        keywords = re.findall(r'\b\w{4,}\b', task_lower)
-        context['keywords'] = [k for k in keywords if k not in 
-                              ['that', 'this', 'with', 'from', 'have']]
+        # Extract keywords, each once, in order of first appearance
+        context['keywords'] = [w for w in words if len(w) >= 4 and w not in _STOPWORDS]
         
         return context
     
+    @staticmethod
+    def _match_keys(regex: re.Pattern, owners: Dict[str, Set[str]],
+                    groups: Dict[str, List[str]], text: str) -> List[str]:
+        """Return the keys of groups whose patterns occur in text, in declaration order."""
+        found = set()
+        for token in set(regex.findall(text)):
+            found |= owners[token]
+        return [key for key in groups if key in found]
+    
     def _select_rules_for_context(self, context: Dict) -> List[str]:
         """Select relevant rules based on context."""
-        selected = set()
+        # Scores are language 10 (universal 2), category 8 and 3 per tag keyword,
+        # with a threshold of 8: any language or category match qualifies, as do
+        # two keyword hits on a universal rule or three on any other rule.
+        matched = 0
+        for lang in context['languages']:
+            matched |= self._by_language.get(lang, 0)
+        for category in context['categories']:
+            matched |= self._by_category.get(category, 0)
+        
+        # Bit-sliced counters: rules with at least one, two and three distinct keyword hits
+        hits1 = hits2 = hits3 = 0
+        for keyword in context['keywords']:
+            mask = self._tag_index.get(keyword, 0)
+            hits3 |= hits2 & mask
+            hits2 |= hits1 & mask
+            hits1 |= mask
+        matched |= hits3 | (hits2 & self._by_language.get('universal', 0))
         
-        for rule_id, rule in self.rules_index['rules'].items():
-            score = 0
-            
-            # Language match
-            if rule['language'] in context['languages']:
-                score += 10
-            elif rule['language'] == 'universal':
-                score += 2
-            
-            # Category match
-            if rule['category'] in context['categories']:
-                score += 8
-            
-            # Keyword match in tags
-            for keyword in context['keywords']:
-                if keyword in ' '.join(rule.get('tags', [])).lower():
-                    score += 3
-            
-            # Add rules with sufficient score
-            if score >= 8:
-                selected.add(rule_id)
+        selected = set()
+        while matched:
+            low_bit = matched & -matched
+            selected.add(self._rule_ids[low_bit.bit_length() - 1])
+            matched ^= low_bit
         
         # Add prerequisites
         selected_with_deps = set(selected)
@@ -167,12 +450,16 @@ class RuleBundler:
     
     def _build_bundle(self, rule_ids: List[str], sections: List[str]) -> Dict:
         """Build bundle with selected rules and sections."""
-        from extract_rule_section import RuleExtractor
-        
         bundle = {
             'rules': {}
         }
         
+        # Output keys for the requested sections, in request order
+        keys = tuple(dict.fromkeys(
+            _SECTION_DISPATCH[section][0] for section in sections if section in _SECTION_DISPATCH
+        ))
+        
+        paths = {}
         for rule_id in rule_ids:
             if rule_id not in self.rules_index['rules']:
                 continue
@@ -183,42 +470,39 @@ class RuleBundler:
             if not rule_path.exists():
                 continue
             
-            extractor = RuleExtractor(rule_path)
-            
-            rule_data = {
+            bundle['rules'][rule_id] = {
                 'metadata': {
                     'rule_id': rule_id,
                     'category': rule_info['category'],
                     'language': rule_info['language'],
                     'severity': rule_info['severity']
-                },
-                'sections': {}
+                }
             }
-            
-            # Extract requested sections
-            for section in sections:
-                if section == 'RULE_SUMMARY':
-                    rule_data['sections']['summary'] = extractor.extract_section('RULE_SUMMARY')
-                elif section == 'requirements' or section == 'MUST_FOLLOW':
-                    rule_data['sections']['requirements'] = extractor.extract_requirements()
-                elif section == 'antipatterns' or section == 'MUST_NOT_DO':
-                    rule_data['sections']['antipatterns'] = extractor.extract_antipatterns()
-                elif section == 'good_examples':
-                    examples = extractor.extract_examples('good')
-                    # Limit to first example to save tokens
-                    rule_data['sections']['good_examples'] = examples[:1] if examples else []
-                elif section == 'CONTEXT_AND_RATIONALE':
-                    rule_data['sections']['context'] = extractor.extract_section('CONTEXT_AND_RATIONALE')
-            
-            bundle['rules'][rule_id] = rule_data
+            paths[rule_id] = rule_path
+        
+        loaded = self._load_sections(paths, keys)
+        for rule_id, rule_data in bundle['rules'].items():
+            rule_sections = {}
+            for key in keys:
+                # Fresh lists, so callers editing a bundle never touch the cache
+                value = loaded[rule_id][key]
+                if key == 'good_examples':
+                    value = value[:1]  # Limit to first example to save tokens
+                elif isinstance(value, list):
+                    value = list(value)
+                rule_sections[key] = value
+            rule_data['sections'] = rule_sections
+        
+        # Write new extractions now, so later bundlers and runs share them
+        if self._cache_dirty:
+            self._save_section_cache()
         
         return bundle
     
     def _estimate_tokens(self, bundle: Dict) -> int:
         """Estimate token count for bundle."""
-        # Rough estimation: 1 token ≈ 4 characters
-        text = json.dumps(bundle)
-        return len(text) // 4
+        # Rough estimation: 1 token ≈ 4 bytes of compact JSON
+        return _size_of(bundle) // 4
     
     def bundle_by_criteria(self, language: Optional[str] = None, 
                           categories: Optional[List[str]] = None,
@@ -241,20 +525,18 @@ class RuleBundler:
         return self._build_bundle(selected_rules, sections)
     
     def create_named_bundle(self, name: str, rule_files: List[str], 
-                           sections: Optional[List[str]] = None) -> Path:
-        """Create a named bundle from specific rule files."""
+                           sections: Optional[List[str]] = None,
+                           pretty: bool = False) -> Path:
+        """Create a named bundle from specific rule files, indented only if pretty."""
         if not sections:
             sections = ['RULE_SUMMARY', 'requirements', 'antipatterns', 'good_examples']
         
-        # Extract rule IDs from file paths
-        rule_ids = []
-        for rule_file in rule_files:
-            rule_path = Path(rule_file)
-            # Find in index by file path
-            for rule_id, rule_info in self.rules_index['rules'].items():
-                if rule_info['file_path'].endswith(rule_path.name):
-                    rule_ids.append(rule_id)
-                    break
+        # Extract rule IDs from file names
+        rule_ids = [
+            self._by_filename[file_name]
+            for file_name in (Path(rule_file).name for rule_file in rule_files)
+            if file_name in self._by_filename
+        ]
         
         # Build bundle
         bundle = self._build_bundle(rule_ids, sections)
@@ -267,7 +549,7 @@ class RuleBundler:
         
         # Save bundle
         bundle_path = self.bundles_dir / f"{name}.json"
-        bundle_path.write_text(json.dumps(bundle, indent=2))
+        _write_json(bundle_path, bundle, pretty)
         
         return bundle_path
     
@@ -275,51 +557,120 @@ class RuleBundler:
         """Load a named bundle."""
         bundle_path = self.bundles_dir / f"{name}.json"
         if bundle_path.exists():
-            return json.loads(bundle_path.read_text())
+            return _loads(bundle_path.read_bytes())
         raise FileNotFoundError(f"Bundle '{name}' not found")
     
     def optimize_bundle(self, bundle: Dict, max_tokens: int = 2000) -> Dict:
-        """Optimize bundle to fit within token limit."""
-        current_tokens = self._estimate_tokens(bundle)
+        """Optimize bundle to fit within token limit.
+        
+        The input bundle is never modified; trimmed bundles are new dicts
+        that share the untouched section values.
+        """
+        # Serialize once, then subtract each dropped section's exact size
+        total_chars = _size_of(bundle)
         
-        if current_tokens <= max_tokens:
+        if total_chars // 4 <= max_tokens:
             return bundle
         
-        # Optimization strategies
-        optimized = bundle.copy()
-        
-        # 1. Remove examples if present
-        for rule_id in optimized['rules']:
-            if 'good_examples' in optimized['rules'][rule_id]['sections']:
-                del optimized['rules'][rule_id]['sections']['good_examples']
-                current_tokens = self._estimate_tokens(optimized)
-                if current_tokens <= max_tokens:
-                    return optimized
-        
-        # 2. Remove context sections
-        for rule_id in optimized['rules']:
-            if 'context' in optimized['rules'][rule_id]['sections']:
-                del optimized['rules'][rule_id]['sections']['context']
-                current_tokens = self._estimate_tokens(optimized)
-                if current_tokens <= max_tokens:
-                    return optimized
+        # 1. Drop examples, then 2. context sections, until the bundle fits
+        dropped = defaultdict(set)
+        for section in ('good_examples', 'context'):
+            for rule_id, rule_data in bundle['rules'].items():
+                sections = rule_data['sections']
+                if section in sections:
+                    remaining = len(sections) - len(dropped[rule_id])
+                    total_chars -= _entry_size(section, sections[section], remaining)
+                    dropped[rule_id].add(section)
+                    if total_chars // 4 <= max_tokens:
+                        return _replace_sections(bundle, lambda rid, secs: {
+                            name: value for name, value in secs.items() if name not in dropped[rid]
+                        })
         
         # 3. Keep only summaries and critical sections
-        for rule_id in optimized['rules']:
-            sections = optimized['rules'][rule_id]['sections']
-            # Keep only summary and either requirements or antipatterns
-            new_sections = {}
-            if 'summary' in sections:
-                new_sections['summary'] = sections['summary']
-            if 'antipatterns' in sections and len(sections['antipatterns']) > 0:
-                new_sections['antipatterns'] = sections['antipatterns'][:3]  # Top 3
-            elif 'requirements' in sections:
-                new_sections['requirements'] = sections['requirements'][:3]  # Top 3
-            optimized['rules'][rule_id]['sections'] = new_sections
-        
-        return optimized
-    
-    def get_predefined_bundles(self) -> Dict[str, Dict]:
+        return _replace_sections(bundle, lambda rid, secs: self._critical_sections(secs))
+    
+    @staticmethod
+    def _critical_sections(sections: Dict) -> Dict:
+        """Keep only summary and either the top antipatterns or the top requirements."""
+        new_sections = {}
+        if 'summary' in sections:
+            new_sections['summary'] = sections['summary']
+        if 'antipatterns' in sections and len(sections['antipatterns']) > 0:
+            new_sections['antipatterns'] = sections['antipatterns'][:3]  # Top 3
+        elif 'requirements' in sections:
+            new_sections['requirements'] = sections['requirements'][:3]  # Top 3
+        return new_sections
+    
+    def _build_predefined(self, config: Dict) -> Dict:
+        """Build a bundle from a predefined configuration."""
+        if 'rules' in config:
+            return self._build_bundle(config['rules'], config['sections'])
+        if 'categories' in config:
+            return self.bundle_by_criteria(
+                categories=config['categories'],
+                sections=config['sections']
+            )
+        
+        rule_ids = list(self.rules_index['rules'])[:config.get('max_rules')]
+        return self._build_bundle(rule_ids, config['sections'])
+    
+    def _inputs_hash(self, config: Dict) -> str:
+        """SHA-256 over the rules index, each rule file's stat info, a bundle config and the tool code."""
+        digest = hashlib.sha256()
+        index_path = self.rules_dir / 'rules-index.json'
+        if index_path.exists():
+            digest.update(index_path.read_bytes())
+        
+        for rule in self.rules_index['rules'].values():
+            if 'file_path' not in rule:
+                continue
+            try:
+                stat = (self.rules_dir / rule['file_path']).stat()
+                digest.update(f"{rule['file_path']}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+            except FileNotFoundError:
+                digest.update(f"{rule['file_path']}:missing\n".encode())
+        
+        digest.update(json.dumps(config, sort_keys=True).encode())
+        digest.update(_code_stamp().encode())
+        return digest.hexdigest()
+    
+    def prebuilt_bundle(self, name: str, pretty: bool = False) -> Optional[Path]:
+        """Path to a predefined bundle's JSON, rebuilt only when its inputs change.
+        
+        Returns None when the prebuilt copy can't be written, e.g. on a
+        read-only checkout; callers then build the bundle in memory.
+        """
+        config = self.get_predefined_bundles()[name]
+        suffix = '.pretty.json' if pretty else '.json'
+        try:
+            prebuilt_dir = self.bundles_dir / '.prebuilt'
+            bundle_path = prebuilt_dir / f"{name}-{self._inputs_hash(config)[:16]}{suffix}"
+            if bundle_path.exists():
+                return bundle_path
+            prebuilt_dir.mkdir(exist_ok=True)
+        except OSError:
+            return None
+        
+        # Per-process name, so concurrent runs never write into each other's file
+        tmp_path = bundle_path.with_name(f'{bundle_path.name}.{os.getpid()}.tmp')
+        try:
+            _write_json(tmp_path, self._build_predefined(config), pretty)
+            os.replace(tmp_path, bundle_path)
+        except OSError:
+            return None
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        
+        # Drop builds of this bundle and format made from older inputs
+        stale_re = re.compile(re.escape(name) + r'-[0-9a-f]{16}' + re.escape(suffix))
+        for stale in prebuilt_dir.iterdir():
+            if stale != bundle_path and stale_re.fullmatch(stale.name):
+                stale.unlink(missing_ok=True)
+        
+        return bundle_path
+    
+    @staticmethod
+    def get_predefined_bundles() -> Dict[str, Dict]:
         """Get predefined bundle configurations."""
         return {
             'typescript-testing': {
@@ -371,12 +722,86 @@ def format_bundle_summary(bundle: Dict) -> str:
     return "\n".join(lines)
 
 
+def _fresh_saved_bundle(name: str) -> Optional[Path]:
+    """A saved bundle written after all of its inputs last changed, or None.
+    
+    Inputs are those of RuleBundler._inputs_hash: the rules index, every
+    rule file it lists and the tool code. Predefined names are never served
+    from here; their prebuilt copies are keyed on that hash.
+    """
+    if name in RuleBundler.get_predefined_bundles():
+        return None
+    
+    bundle_path = RULES_DIR / 'bundles' / f"{name}.json"
+    try:
+        saved_at = bundle_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    
+    inputs = list(_CODE_PATHS)
+    index_path = RULES_DIR / 'rules-index.json'
+    if index_path.exists():
+        inputs.append(index_path)
+        inputs.extend(
+            RULES_DIR / rule['file_path']
+            for rule in _loads(index_path.read_bytes())['rules'].values()
+            if 'file_path' in rule
+        )
+    
+    for input_path in inputs:
+        try:
+            if input_path.stat().st_mtime_ns > saved_at:
+                return None
+        except FileNotFoundError:
+            continue
+    return bundle_path
+
+
+def _emit_bundle_file(bundle_path: Path):
+    """Copy bundle JSON to --output if given, otherwise stream it to stdout."""
+    if '--output' in sys.argv:
+        output_idx = sys.argv.index('--output') + 1
+        output_path = Path(sys.argv[output_idx])
+        shutil.copyfile(bundle_path, output_path)
+        print(f"Bundle saved to: {output_path}")
+    else:
+        sys.stdout.flush()
+        with bundle_path.open('rb') as f:
+            shutil.copyfileobj(f, sys.stdout.buffer)
+        print()
+
+
+def _emit_bundle(bundle: Dict, pretty: bool = False):
+    """Write bundle JSON to --output if given, otherwise to stdout."""
+    if '--output' in sys.argv:
+        output_idx = sys.argv.index('--output') + 1
+        output_path = Path(sys.argv[output_idx])
+        _write_json(output_path, bundle, pretty)
+        print(f"Bundle saved to: {output_path}")
+    else:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(_dumps(bundle, pretty))
+        print()
+
+
 def main():
     """Command-line interface."""
     if len(sys.argv) < 2:
         print(__doc__)
         sys.exit(1)
     
+    # Indented JSON only on request; compact is smaller and faster to write
+    pretty = '--pretty' in sys.argv
+    if pretty:
+        sys.argv.remove('--pretty')
+    
+    # Saved bundles newer than their inputs are served as stored, before any rule loading
+    if sys.argv[1] == '--bundle' and len(sys.argv) > 2:
+        saved_path = _fresh_saved_bundle(sys.argv[2])
+        if saved_path is not None:
+            _emit_bundle_file(saved_path)
+            return
+    
     bundler = RuleBundler()
     
     if sys.argv[1] == '--task':
@@ -407,22 +832,12 @@ def main():
             config = predefined[bundle_name]
             print(f"Creating bundle: {config['description']}")
             
-            # Build based on config
-            if 'rules' in config:
-                bundle = bundler._build_bundle(config['rules'], config['sections'])
-            elif 'categories' in config:
-                bundle = bundler.bundle_by_criteria(
-                    categories=config['categories'],
-                    sections=config['sections']
-                )
-            
-            if '--output' in sys.argv:
-                output_idx = sys.argv.index('--output') + 1
-                output_path = Path(sys.argv[output_idx])
-                output_path.write_text(json.dumps(bundle, indent=2))
-                print(f"Bundle saved to: {output_path}")
+            # Served from the prebuilt copy unless the rules or tools changed
+            bundle_path = bundler.prebuilt_bundle(bundle_name, pretty)
+            if bundle_path is not None:
+                _emit_bundle_file(bundle_path)
             else:
-                print(json.dumps(bundle, indent=2))
+                _emit_bundle(bundler._build_predefined(config), pretty)
         else:
             print(f"Unknown bundle: {bundle_name}")
             print(f"Available: {', '.join(predefined.keys())}")
@@ -432,7 +847,7 @@ def main():
         name = sys.argv[2]
         rule_files = sys.argv[3:]
         
-        bundle_path = bundler.create_named_bundle(name, rule_files)
+        bundle_path = bundler.create_named_bundle(name, rule_files, pretty=pretty)
         print(f"Bundle created: {bundle_path}")
     
     elif sys.argv[1] == '--optimize':
@@ -443,7 +858,7 @@ def main():
         if len(sys.argv) > 4 and sys.argv[3] == '--max-tokens':
             max_tokens = int(sys.argv[4])
         
-        bundle = json.loads(bundle_file.read_text())
+        bundle = _loads(bundle_file.read_bytes())
         optimized = bundler.optimize_bundle(bundle, max_tokens)
         
         print(f"Original tokens: {bundler._estimate_tokens(bundle)}")
@@ -452,7 +867,7 @@ def main():
         if '--output' in sys.argv:
             output_idx = sys.argv.index('--output') + 1
             output_path = Path(sys.argv[output_idx])
-            output_path.write_text(json.dumps(optimized, indent=2))
+            _write_json(output_path, optimized, pretty)
             print(f"Optimized bundle saved to: {output_path}")
 
 
@@ -14,26 +14,59 @@ import json
 import yaml
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from itertools import combinations
+from typing import Dict, FrozenSet, List, Tuple, Optional
 from difflib import unified_diff, SequenceMatcher
 
+try:
+    from rapidfuzz.distance import Indel
+except ImportError:  # optional speedup; difflib gives comparable scores
+    Indel = None
+
+# Fixed parts of generate_migration_guide's output
+MIGRATION_GUIDE_HEADER = "# Migration Guide\n\nMigrating from {old} to {new}\n\n"
+MIGRATION_STEPS = (
+    "## Migration Steps\n\n"
+    "1. Review all modified requirements above\n"
+    "2. Update your codebase to comply with new requirements\n"
+    "3. Remove code that violates new antipatterns\n"
+    "4. Run validation tools to ensure compliance\n"
+)
+
 
 class RuleDiffer:
     """Compare and analyze differences between rules."""
     
     def __init__(self):
         self.rules_dir = Path(__file__).parent.parent
-        
+        # extract_all() output per rule path, so each file is parsed once per differ
+        self._extract_cache: Dict[Path, Dict] = {}
+        # Lowercased requirement words per rule path, for Jaccard similarity
+        self._token_cache: Dict[Path, FrozenSet[str]] = {}
+        
+    def _get_extractor_data(self, rule_path: Path) -> Dict:
+        """Return extract_all() for a rule, parsing it on first use."""
+        data = self._extract_cache.get(rule_path)
+        if data is None:
+            from extract_rule_section import RuleExtractor
+            
+            data = self._extract_cache[rule_path] = RuleExtractor(rule_path).extract_all()
+        return data
+    
+    def _get_requirement_tokens(self, rule_path: Path) -> FrozenSet[str]:
+        """Return the set of words across a rule's requirements, tokenizing on first use."""
+        tokens = self._token_cache.get(rule_path)
+        if tokens is None:
+            reqs = self._get_extractor_data(rule_path)['requirements']
+            tokens = self._token_cache[rule_path] = frozenset(
+                ' '.join(r['requirement'] for r in reqs).lower().split()
+            )
+        return tokens
+    
     def diff_rules(self, rule1_path: Path, rule2_path: Path) -> Dict:
         """Compare two rule files and return structured diff."""
-        from extract_rule_section import RuleExtractor
-        
-        # Extract data from both rules
-        extractor1 = RuleExtractor(rule1_path)
-        extractor2 = RuleExtractor(rule2_path)
-        
-        data1 = extractor1.extract_all()
-        data2 = extractor2.extract_all()
+        data1 = self._get_extractor_data(rule1_path)
+        data2 = self._get_extractor_data(rule2_path)
         
         diff_result = {
             'metadata_changes': self._diff_metadata(data1['metadata'], data2['metadata']),
@@ -53,19 +86,20 @@ class RuleDiffer:
             'modified': {}
         }
         
-        all_keys = set(meta1.keys()) | set(meta2.keys())
-        
-        for key in all_keys:
-            if key not in meta1:
-                changes['added'][key] = meta2[key]
-            elif key not in meta2:
-                changes['removed'][key] = meta1[key]
-            elif meta1[key] != meta2[key]:
+        # Walk each side once instead of building a union of their keys
+        for key, old in meta1.items():
+            if key not in meta2:
+                changes['removed'][key] = old
+            elif old != meta2[key]:
                 changes['modified'][key] = {
-                    'old': meta1[key],
+                    'old': old,
                     'new': meta2[key]
                 }
         
+        for key, new in meta2.items():
+            if key not in meta1:
+                changes['added'][key] = new
+        
         return changes
     
     def _diff_requirements(self, reqs1: List[Dict], reqs2: List[Dict]) -> Dict:
@@ -80,23 +114,27 @@ class RuleDiffer:
         reqs1_by_id = {r['id']: r for r in reqs1}
         reqs2_by_id = {r['id']: r for r in reqs2}
         
-        # Find changes
-        for req_id in set(reqs1_by_id.keys()) | set(reqs2_by_id.keys()):
-            if req_id not in reqs1_by_id:
-                changes['added'].append(reqs2_by_id[req_id])
-            elif req_id not in reqs2_by_id:
-                changes['removed'].append(reqs1_by_id[req_id])
-            elif reqs1_by_id[req_id] != reqs2_by_id[req_id]:
+        # Find changes, in rule order. Cached extractions are shared, so an
+        # identical object (e.g. a rule diffed against itself) skips the deep compare
+        for req_id, old in reqs1_by_id.items():
+            new = reqs2_by_id.get(req_id)
+            if new is None:
+                changes['removed'].append(old)
+            elif old is not new and old != new:
                 changes['modified'].append({
                     'id': req_id,
-                    'old': reqs1_by_id[req_id],
-                    'new': reqs2_by_id[req_id],
+                    'old': old,
+                    'new': new,
                     'similarity': self._calculate_similarity(
-                        reqs1_by_id[req_id]['requirement'],
-                        reqs2_by_id[req_id]['requirement']
+                        old['requirement'],
+                        new['requirement']
                     )
                 })
         
+        for req_id, new in reqs2_by_id.items():
+            if req_id not in reqs1_by_id:
+                changes['added'].append(new)
+        
         return changes
     
     def _diff_antipatterns(self, ants1: List[Dict], ants2: List[Dict]) -> Dict:
@@ -111,39 +149,53 @@ class RuleDiffer:
         ants1_by_id = {a['id']: a for a in ants1}
         ants2_by_id = {a['id']: a for a in ants2}
         
-        for ant_id in set(ants1_by_id.keys()) | set(ants2_by_id.keys()):
-            if ant_id not in ants1_by_id:
-                changes['added'].append(ants2_by_id[ant_id])
-            elif ant_id not in ants2_by_id:
-                changes['removed'].append(ants1_by_id[ant_id])
-            elif ants1_by_id[ant_id] != ants2_by_id[ant_id]:
+        for ant_id, old in ants1_by_id.items():
+            new = ants2_by_id.get(ant_id)
+            if new is None:
+                changes['removed'].append(old)
+            elif old is not new and old != new:
                 changes['modified'].append({
                     'id': ant_id,
-                    'old': ants1_by_id[ant_id],
-                    'new': ants2_by_id[ant_id]
+                    'old': old,
+                    'new': new
                 })
         
+        for ant_id, new in ants2_by_id.items():
+            if ant_id not in ants1_by_id:
+                changes['added'].append(new)
+        
         return changes
     
     def _diff_examples(self, data1: Dict, data2: Dict) -> Dict:
         """Compare examples between rules."""
+        good1, good2 = len(data1['good_examples']), len(data2['good_examples'])
+        bad1, bad2 = len(data1['bad_examples']), len(data2['bad_examples'])
+        
         return {
             'good_examples': {
-                'added': len(data2['good_examples']) - len(data1['good_examples']),
-                'removed': 0 if len(data2['good_examples']) >= len(data1['good_examples']) else len(data1['good_examples']) - len(data2['good_examples']),
-                'total_before': len(data1['good_examples']),
-                'total_after': len(data2['good_examples'])
+                'added': max(0, good2 - good1),
+                'removed': max(0, good1 - good2),
+                'total_before': good1,
+                'total_after': good2
             },
             'bad_examples': {
-                'added': len(data2['bad_examples']) - len(data1['bad_examples']),
-                'removed': 0 if len(data2['bad_examples']) >= len(data1['bad_examples']) else len(data1['bad_examples']) - len(data2['bad_examples']),
-                'total_before': len(data1['bad_examples']),
-                'total_after': len(data2['bad_examples'])
+                'added': max(0, bad2 - bad1),
+                'removed': max(0, bad1 - bad2),
+                'total_before': bad1,
+                'total_after': bad2
             }
         }
     
     def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """Calculate similarity between two texts."""
+        """Calculate similarity between two texts.
+        
+        Requirements often change only in their rationale, so identical
+        text is answered without running the matcher at all.
+        """
+        if text1 == text2:
+            return 1.0
+        if Indel is not None:
+            return Indel.normalized_similarity(text1, text2)
         return SequenceMatcher(None, text1, text2).ratio()
     
     def _generate_summary(self, data1: Dict, data2: Dict) -> Dict:
@@ -192,47 +244,44 @@ class RuleDiffer:
                         'file_path': rule_data['file_path']
                     })
         
+        # Resolve and parse each rule once up front; the pairwise loop only reads caches
+        paths = [self.rules_dir / rule['file_path'] for rule in rules]
+        for path in paths:
+            try:
+                self._get_requirement_tokens(path)
+            except Exception:
+                # Unreadable rules share no words with anything, so score 0.0
+                self._token_cache[path] = frozenset()
+        
         # Compare rules pairwise
         comparisons = []
-        for i in range(len(rules)):
-            for j in range(i + 1, len(rules)):
-                rule1_path = self.rules_dir / rules[i]['file_path']
-                rule2_path = self.rules_dir / rules[j]['file_path']
-                
-                similarity = self._calculate_rule_similarity(rule1_path, rule2_path)
-                
-                comparisons.append({
-                    'rule1': rules[i]['rule_id'],
-                    'rule2': rules[j]['rule_id'],
-                    'similarity': similarity,
-                    'both_severity': rules[i]['severity'] == rules[j]['severity']
-                })
+        for (rule1, path1), (rule2, path2) in combinations(zip(rules, paths), 2):
+            similarity = self._calculate_rule_similarity(path1, path2)
+            
+            comparisons.append({
+                'rule1': rule1['rule_id'],
+                'rule2': rule2['rule_id'],
+                'similarity': similarity,
+                'both_severity': rule1['severity'] == rule2['severity']
+            })
         
         return sorted(comparisons, key=lambda x: x['similarity'], reverse=True)
     
     def _calculate_rule_similarity(self, rule1_path: Path, rule2_path: Path) -> float:
         """Calculate overall similarity between two rules."""
-        from extract_rule_section import RuleExtractor
-        
         try:
-            ext1 = RuleExtractor(rule1_path)
-            ext2 = RuleExtractor(rule2_path)
+            # Simple Jaccard similarity over requirement words
+            set1 = self._get_requirement_tokens(rule1_path)
+            set2 = self._get_requirement_tokens(rule2_path)
             
-            # Compare requirements
-            reqs1 = [r['requirement'] for r in ext1.extract_requirements()]
-            reqs2 = [r['requirement'] for r in ext2.extract_requirements()]
-            
-            # Simple Jaccard similarity
-            set1 = set(' '.join(reqs1).lower().split())
-            set2 = set(' '.join(reqs2).lower().split())
-            
-            if not set1 and not set2:
+            # A rule without requirement words shares nothing with anything
+            if not set1 or not set2:
                 return 0.0
             
             intersection = len(set1 & set2)
-            union = len(set1 | set2)
+            union = len(set1) + len(set2) - intersection
             
-            return intersection / union if union > 0 else 0.0
+            return intersection / union
         except:
             return 0.0
     
@@ -262,56 +311,54 @@ class RuleDiffer:
         """Generate a migration guide between rule versions."""
         diff_data = self.diff_rules(old_rule, new_rule)
         
-        guide = f"# Migration Guide\n\n"
-        guide += f"Migrating from {old_rule.name} to {new_rule.name}\n\n"
+        # Collect fragments and join once rather than growing a string
+        parts: List[str] = [MIGRATION_GUIDE_HEADER.format(old=old_rule.name, new=new_rule.name)]
         
         # Metadata changes
         if diff_data['metadata_changes']['modified']:
-            guide += "## Metadata Changes\n\n"
+            parts.append("## Metadata Changes\n\n")
             for key, change in diff_data['metadata_changes']['modified'].items():
-                guide += f"- **{key}**: {change['old']} → {change['new']}\n"
-            guide += "\n"
+                parts.append(f"- **{key}**: {change['old']} → {change['new']}\n")
+            parts.append("\n")
         
         # Requirement changes
         req_changes = diff_data['requirement_changes']
         if req_changes['added'] or req_changes['removed'] or req_changes['modified']:
-            guide += "## Requirement Changes\n\n"
+            parts.append("## Requirement Changes\n\n")
             
             if req_changes['added']:
-                guide += "### New Requirements\n"
+                parts.append("### New Requirements\n")
                 for req in req_changes['added']:
-                    guide += f"- **{req['id']}**: {req['requirement']}\n"
-                guide += "\n"
+                    parts.append(f"- **{req['id']}**: {req['requirement']}\n")
+                parts.append("\n")
             
             if req_changes['removed']:
-                guide += "### Removed Requirements\n"
+                parts.append("### Removed Requirements\n")
                 for req in req_changes['removed']:
-                    guide += f"- **{req['id']}**: {req['requirement']}\n"
-                guide += "\n"
+                    parts.append(f"- **{req['id']}**: {req['requirement']}\n")
+                parts.append("\n")
             
             if req_changes['modified']:
-                guide += "### Modified Requirements\n"
+                parts.append("### Modified Requirements\n")
                 for change in req_changes['modified']:
-                    guide += f"- **{change['id']}** (similarity: {change['similarity']:.0%})\n"
-                    guide += f"  - Old: {change['old']['requirement']}\n"
-                    guide += f"  - New: {change['new']['requirement']}\n"
-                guide += "\n"
+                    parts.append(
+                        f"- **{change['id']}** (similarity: {change['similarity']:.0%})\n"
+                        f"  - Old: {change['old']['requirement']}\n"
+                        f"  - New: {change['new']['requirement']}\n"
+                    )
+                parts.append("\n")
         
         # Breaking changes
         if diff_data['summary']['breaking_changes']:
-            guide += "## ⚠️ Breaking Changes\n\n"
+            parts.append("## ⚠️ Breaking Changes\n\n")
             for change in diff_data['summary']['breaking_changes']:
-                guide += f"- {change}\n"
-            guide += "\n"
+                parts.append(f"- {change}\n")
+            parts.append("\n")
         
         # Migration steps
-        guide += "## Migration Steps\n\n"
-        guide += "1. Review all modified requirements above\n"
-        guide += "2. Update your codebase to comply with new requirements\n"
-        guide += "3. Remove code that violates new antipatterns\n"
-        guide += "4. Run validation tools to ensure compliance\n"
+        parts.append(MIGRATION_STEPS)
         
-        return guide
+        return ''.join(parts)
 
 
 def format_diff_output(diff_data: Dict) -> str:
@@ -0,0 +1,36 @@
+"""Load the hyphenated tool scripts as modules for the tests."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+
+
+def _load_tool(module_name: str, file_name: str):
+    """Import a tool script under module_name, reusing an earlier import."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    
+    spec = importlib.util.spec_from_file_location(module_name, TOOLS_DIR / file_name)
+    module = importlib.util.module_from_spec(spec)
+    # Registered first: the bundler imports the extractor by this name, and
+    # validator pool workers unpickle their task function through it
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def rule_bundler():
+    """The rule-bundler.py module."""
+    _load_tool('extract_rule_section', 'extract-rule-section.py')
+    return _load_tool('rule_bundler', 'rule-bundler.py')
+
+
+@pytest.fixture(scope='session')
+def validate_rule():
+    """The validate-rule.py module."""
+    return _load_tool('validate_rule', 'validate-rule.py')
@@ -0,0 +1,292 @@
+"""Tests for rule-bundler.py caches and bundle optimization."""
+
+import copy
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+RULES_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Rule id -> (file copied into the test tree, category)
+RULES = {
+    'typescript-test-naming': ('typescript/test-naming/jest-react-testing-library-llm.md', 'test-naming'),
+    'universal-test-naming': ('templates/llm-optimized-rule-template.md', 'test-naming'),
+}
+
+ALL_SECTIONS = ['RULE_SUMMARY', 'requirements', 'antipatterns', 'good_examples', 'CONTEXT_AND_RATIONALE']
+
+
+def _touch_later(path: Path):
+    """Move path's mtime forward a second so stat-based keys always change."""
+    mtime_ns = path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _rewrite(path: Path, old: str, new: str):
+    """Replace old with new in path and move its mtime forward."""
+    content = path.read_text()
+    assert old in content
+    path.write_text(content.replace(old, new))
+    _touch_later(path)
+
+
+@pytest.fixture
+def rules_tree(tmp_path, monkeypatch, rule_bundler):
+    """A two-rule copy of the rules tree, with stand-ins for the tool sources."""
+    index = {'rules': {}}
+    for rule_id, (file_path, category) in RULES.items():
+        target = tmp_path / file_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(RULES_DIR / file_path, target)
+        index['rules'][rule_id] = {
+            'file_path': file_path,
+            'category': category,
+            'language': 'typescript',
+            'severity': 'required',
+            'tags': ['testing']
+        }
+    (tmp_path / 'rules-index.json').write_text(json.dumps(index))
+    
+    code_dir = tmp_path / 'code'
+    code_dir.mkdir()
+    code_paths = (code_dir / 'rule-bundler.py', code_dir / 'extract-rule-section.py')
+    for code_path in code_paths:
+        code_path.write_text('')
+    
+    monkeypatch.setattr(rule_bundler, 'RULES_DIR', tmp_path)
+    monkeypatch.setattr(rule_bundler, '_CODE_PATHS', code_paths)
+    return tmp_path
+
+
+def _summaries(bundle_path: Path) -> dict:
+    """Summary section of each rule in a bundle file."""
+    bundle = json.loads(bundle_path.read_text())
+    return {rule_id: data['sections']['summary'] for rule_id, data in bundle['rules'].items()}
+
+
+def _reference_optimize(bundler, bundle, max_tokens):
+    """Drop sections one at a time, re-measuring the whole bundle after each drop."""
+    if bundler._estimate_tokens(bundle) <= max_tokens:
+        return bundle
+    
+    for section in ('good_examples', 'context'):
+        for rule_data in bundle['rules'].values():
+            if section in rule_data['sections']:
+                del rule_data['sections'][section]
+                if bundler._estimate_tokens(bundle) <= max_tokens:
+                    return bundle
+    
+    for rule_data in bundle['rules'].values():
+        rule_data['sections'] = bundler._critical_sections(rule_data['sections'])
+    return bundle
+
+
+def test_prebuilt_bundle_is_reused_while_inputs_are_unchanged(rules_tree, rule_bundler):
+    bundler = rule_bundler.RuleBundler()
+    first = bundler.prebuilt_bundle('typescript-testing')
+    
+    assert first.exists()
+    assert bundler.prebuilt_bundle('typescript-testing') == first
+    assert rule_bundler.RuleBundler().prebuilt_bundle('typescript-testing') == first
+
+
+def test_editing_a_rule_rebuilds_its_prebuilt_bundle(rules_tree, rule_bundler):
+    first = rule_bundler.RuleBundler().prebuilt_bundle('typescript-testing')
+    _rewrite(rules_tree / RULES['typescript-test-naming'][0],
+             'Name tests as business scenarios', 'Name every test as a business scenario')
+    
+    second = rule_bundler.RuleBundler().prebuilt_bundle('typescript-testing')
+    
+    assert second != first
+    assert not first.exists()
+    assert _summaries(second)['typescript-test-naming'].startswith('Name every test as a business scenario')
+
+
+def test_changing_a_bundle_config_rebuilds_its_prebuilt_bundle(rules_tree, rule_bundler, monkeypatch):
+    bundler = rule_bundler.RuleBundler()
+    first = bundler.prebuilt_bundle('typescript-testing')
+    
+    configs = bundler.get_predefined_bundles()
+    configs['typescript-testing']['sections'] = ['RULE_SUMMARY']
+    monkeypatch.setattr(rule_bundler.RuleBundler, 'get_predefined_bundles', lambda self: configs)
+    second = bundler.prebuilt_bundle('typescript-testing')
+    
+    assert second != first
+    bundle = json.loads(second.read_text())
+    assert all(list(data['sections']) == ['summary'] for data in bundle['rules'].values())
+
+
+def test_editing_the_tool_code_rebuilds_prebuilt_bundles(rules_tree, rule_bundler):
+    first = rule_bundler.RuleBundler().prebuilt_bundle('typescript-testing')
+    _touch_later(rule_bundler._CODE_PATHS[1])
+    
+    second = rule_bundler.RuleBundler().prebuilt_bundle('typescript-testing')
+    
+    assert second != first
+    assert not first.exists()
+
+
+def test_prebuilt_bundle_write_failure_is_not_fatal(rules_tree, rule_bundler, monkeypatch):
+    def failing_write(path, obj, pretty=False):
+        path.write_text('partial')
+        raise OSError('disk full')
+    
+    monkeypatch.setattr(rule_bundler, '_write_json', failing_write)
+    
+    assert rule_bundler.RuleBundler().prebuilt_bundle('typescript-testing') is None
+    assert list((rules_tree / 'bundles' / '.prebuilt').iterdir()) == []
+
+
+def test_section_cache_survives_a_restart(rules_tree, rule_bundler):
+    bundler = rule_bundler.RuleBundler()
+    expected = bundler.bundle_by_criteria(sections=ALL_SECTIONS)
+    bundler._save_section_cache()
+    
+    restarted = rule_bundler.RuleBundler()
+    
+    assert set(restarted._load_section_cache()) == set(RULES)
+    assert restarted.bundle_by_criteria(sections=ALL_SECTIONS) == expected
+
+
+@pytest.mark.parametrize('changed', ['index', 'bundler code', 'extractor code'])
+def test_section_cache_is_dropped_when_its_inputs_change(rules_tree, rule_bundler, changed):
+    bundler = rule_bundler.RuleBundler()
+    bundler.bundle_by_criteria()
+    bundler._save_section_cache()
+    
+    changed_path = {
+        'index': rules_tree / 'rules-index.json',
+        'bundler code': rule_bundler._CODE_PATHS[0],
+        'extractor code': rule_bundler._CODE_PATHS[1],
+    }[changed]
+    _touch_later(changed_path)
+    
+    assert rule_bundler.RuleBundler()._load_section_cache() == {}
+
+
+def test_editing_a_rule_refreshes_its_cached_sections(rules_tree, rule_bundler):
+    bundler = rule_bundler.RuleBundler()
+    bundler.bundle_by_criteria()
+    bundler._save_section_cache()
+    _rewrite(rules_tree / RULES['typescript-test-naming'][0],
+             'Name tests as business scenarios', 'Name every test as a business scenario')
+    
+    bundle = rule_bundler.RuleBundler().bundle_by_criteria()
+    
+    summary = bundle['rules']['typescript-test-naming']['sections']['summary']
+    assert summary.startswith('Name every test as a business scenario')
+
+
+def test_optimized_bundle_matches_dropping_sections_one_at_a_time(rules_tree, rule_bundler):
+    bundler = rule_bundler.RuleBundler()
+    bundle = bundler.bundle_by_criteria(sections=ALL_SECTIONS)
+    
+    # Every limit up to the full size, so each drop boundary is hit exactly
+    for max_tokens in range(bundler._estimate_tokens(bundle) + 2):
+        expected = _reference_optimize(bundler, copy.deepcopy(bundle), max_tokens)
+        assert bundler.optimize_bundle(bundle, max_tokens) == expected, max_tokens
+
+
+def test_optimizing_a_bundle_leaves_the_input_unchanged(rules_tree, rule_bundler):
+    bundler = rule_bundler.RuleBundler()
+    bundle = bundler.bundle_by_criteria(sections=ALL_SECTIONS)
+    original = copy.deepcopy(bundle)
+    
+    for max_tokens in range(bundler._estimate_tokens(bundle) + 2):
+        bundler.optimize_bundle(bundle, max_tokens)
+    
+    assert bundle == original
+
+
+def test_bundles_serialize_with_plain_json(rules_tree, rule_bundler):
+    bundler = rule_bundler.RuleBundler()
+    
+    bundle = bundler.bundle_by_criteria(sections=ALL_SECTIONS)
+    
+    assert json.loads(json.dumps(bundle)) == bundle
+
+
+def _record_extractions(rule_bundler, monkeypatch):
+    """List that collects the section keys of every extraction from now on."""
+    extracted = []
+    extract_sections = rule_bundler._extract_sections
+    
+    def recording_extract(path_str, mtime_ns, keys):
+        extracted.extend(keys)
+        return extract_sections(path_str, mtime_ns, keys)
+    
+    monkeypatch.setattr(rule_bundler, '_extract_sections', recording_extract)
+    return extracted
+
+
+def test_only_requested_sections_are_extracted(rules_tree, rule_bundler, monkeypatch):
+    extracted = _record_extractions(rule_bundler, monkeypatch)
+    bundler = rule_bundler.RuleBundler()
+    
+    bundler.bundle_by_criteria(sections=['RULE_SUMMARY'])
+    assert extracted == ['summary', 'summary']
+    
+    bundler.bundle_by_criteria(sections=['RULE_SUMMARY', 'requirements'])
+    assert extracted == ['summary', 'summary', 'requirements', 'requirements']
+
+
+def test_bundlers_in_one_process_share_extracted_sections(rules_tree, rule_bundler, monkeypatch):
+    extracted = _record_extractions(rule_bundler, monkeypatch)
+    expected = rule_bundler.RuleBundler().bundle_by_criteria(sections=ALL_SECTIONS)
+    extracted.clear()
+    
+    bundle = rule_bundler.RuleBundler().bundle_by_criteria(sections=ALL_SECTIONS)
+    
+    assert bundle == expected
+    assert extracted == []
+
+
+def test_front_matter_edits_reuse_cached_sections(rules_tree, rule_bundler, monkeypatch):
+    extracted = _record_extractions(rule_bundler, monkeypatch)
+    expected = rule_bundler.RuleBundler().bundle_by_criteria(sections=ALL_SECTIONS)
+    _rewrite(rules_tree / RULES['typescript-test-naming'][0],
+             'last_updated: 2024-01-20', 'last_updated: 2024-02-01')
+    extracted.clear()
+    
+    bundle = rule_bundler.RuleBundler().bundle_by_criteria(sections=ALL_SECTIONS)
+    
+    assert bundle == expected
+    assert extracted == []
+
+
+def _save_bundle(rules_tree: Path, name: str) -> Path:
+    """Write a saved bundle file newer than every input in the tree."""
+    bundle_path = rules_tree / 'bundles' / f"{name}.json"
+    bundle_path.parent.mkdir(exist_ok=True)
+    bundle_path.write_text('{"rules": {}}')
+    newest = max(path.stat().st_mtime_ns for path in rules_tree.rglob('*') if path.is_file())
+    os.utime(bundle_path, ns=(newest + 1_000_000_000, newest + 1_000_000_000))
+    return bundle_path
+
+
+def test_saved_bundle_is_served_while_its_inputs_are_unchanged(rules_tree, rule_bundler):
+    bundle_path = _save_bundle(rules_tree, 'my-bundle')
+    
+    assert rule_bundler._fresh_saved_bundle('my-bundle') == bundle_path
+
+
+@pytest.mark.parametrize('changed', ['index', 'rule', 'tool code'])
+def test_saved_bundle_is_stale_once_an_input_changes(rules_tree, rule_bundler, changed):
+    bundle_path = _save_bundle(rules_tree, 'my-bundle')
+    changed_path = {
+        'index': rules_tree / 'rules-index.json',
+        'rule': rules_tree / RULES['typescript-test-naming'][0],
+        'tool code': rule_bundler._CODE_PATHS[0],
+    }[changed]
+    os.utime(changed_path, ns=(bundle_path.stat().st_mtime_ns + 1,) * 2)
+    
+    assert rule_bundler._fresh_saved_bundle('my-bundle') is None
+
+
+def test_saved_bundle_never_shadows_a_predefined_bundle(rules_tree, rule_bundler):
+    _save_bundle(rules_tree, 'code-review')
+    
+    assert rule_bundler._fresh_saved_bundle('code-review') is None
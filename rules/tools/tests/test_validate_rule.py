@@ -0,0 +1,27 @@
+"""Tests for validate-rule.py batch validation."""
+
+
+def _validate_all(validate_rule, capsys):
+    """Return value and printed report of an uncached validate_all_rules run."""
+    all_valid = validate_rule.validate_all_rules(use_cache=False)
+    return all_valid, capsys.readouterr().out
+
+
+def test_parallel_validation_reports_the_same_results_as_serial(validate_rule, capsys, monkeypatch):
+    serial = _validate_all(validate_rule, capsys)
+    
+    pools = []
+    
+    class RecordingPool(validate_rule.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+    
+    # Force the worker pool even for the small rule set in this repo
+    monkeypatch.setattr(validate_rule, '_PARALLEL_MIN_BYTES', 0)
+    monkeypatch.setattr(validate_rule.os, 'cpu_count', lambda: 4)
+    monkeypatch.setattr(validate_rule, 'ProcessPoolExecutor', RecordingPool)
+    parallel = _validate_all(validate_rule, capsys)
+    
+    assert len(pools) == 1
+    assert parallel == serial
@@ -6,53 +6,107 @@ Validates workflow-tools rules against the schema and content structure.
 Usage:
     python validate-rule.py <rule-file>
     python validate-rule.py --all
+    python validate-rule.py --all --no-cache
     python validate-rule.py --fix <rule-file>
+
+`--all` results are cached in $XDG_CACHE_HOME/workflow-tools/validator-cache.json
+(default ~/.cache), so unchanged files are not re-validated; --no-cache bypasses it.
 """
 
+import os
 import sys
 import re
 import json
+import functools
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+# Compiled once at import; validate_all_rules runs these over every rule file
+_REQ_ID_RE = re.compile(r'\*\*\[(REQ\d+)\]\*\*')
+_ANT_ID_RE = re.compile(r'\*\*\[(ANT\d+)\]\*\*')
+_EXTRACT_MARKER_RE = re.compile(r'<!-- EXTRACT:(\w+):(start|end) -->')
+_GOOD_EXAMPLE_RE = re.compile(r'### (GOOD_EXAMPLE_\d+)')
+_BAD_EXAMPLE_RE = re.compile(r'### (BAD_EXAMPLE_\d+)')
+_NEXT_SUBSECTION_RE = re.compile(r'\n### (?!MUST_FOLLOW)')
+# Lookarounds leave the asterisks unconsumed, so adjacent tags sharing them all match
+_SHORT_ID_RE = re.compile(r'(?<=\*\*\[)(REQ|ANT)(\d{1,2})(?=\]\*\*)')
+_LOOSE_EXAMPLE_RE = re.compile(r'### (Good|Bad) Example (\d)')
+
+_STANDARD_MARKERS = frozenset({'requirements', 'antipatterns', 'patterns', 'metrics'})
+
+# Worker startup and per-file IPC cost about as much as validating a typical
+# few-KB rule, so validate_all_rules only fans out for this much pending content
+_PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=8)
+def _read_json_schema(path_str: str, mtime_ns: int) -> Dict:
+    """Parse a JSON schema file, keyed on mtime so edits invalidate the entry."""
+    return json.loads(Path(path_str).read_text())
+
+
+@functools.lru_cache(maxsize=8)
+def _read_yaml_schema(path_str: str, mtime_ns: int) -> Dict:
+    """Parse a YAML schema file, keyed like _read_json_schema."""
+    return yaml.load(Path(path_str).read_text(), Loader=_YamlLoader)
+
+
+def _load_schema(schema_file: Path, reader) -> Dict:
+    """Load a schema through its cached reader; {} if the file doesn't exist."""
+    try:
+        mtime_ns = schema_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    return reader(str(schema_file), mtime_ns)
+
 
 class RuleValidator:
-    """Validates rule files against schema and structure requirements."""
+    """Validates rule files against schema and structure requirements.
+    
+    Schemas are parsed once per process and shared between validators,
+    so they should be treated as read-only.
+    """
     
     def __init__(self):
         self.schema_dir = Path(__file__).parent.parent / 'schemas'
         self.metadata_schema = self._load_json_schema()
         self.content_schema = self._load_content_schema()
+        # (section, heading) pairs checked against every file's content
+        self._section_headings = [
+            (section, f"## {section}")
+            for section in self.content_schema.get('required_sections', [])
+        ]
         self.errors = []
         self.warnings = []
         
     def _load_json_schema(self) -> Dict:
         """Load the JSON schema for metadata validation."""
-        schema_file = self.schema_dir / 'rule-schema.json'
-        if schema_file.exists():
-            return json.loads(schema_file.read_text())
-        return {}
+        return _load_schema(self.schema_dir / 'rule-schema.json', _read_json_schema)
     
     def _load_content_schema(self) -> Dict:
         """Load the YAML schema for content structure validation."""
-        schema_file = self.schema_dir / 'rule-content-schema.yaml'
-        if schema_file.exists():
-            return yaml.safe_load(schema_file.read_text())
-        return {}
+        return _load_schema(self.schema_dir / 'rule-content-schema.yaml', _read_yaml_schema)
     
     def validate_file(self, rule_file: Path) -> Tuple[List[str], List[str]]:
         """Validate a single rule file."""
         self.errors = []
         self.warnings = []
         
-        if not rule_file.exists():
+        # Every check below needs the whole file, so read it once up front
+        try:
+            content = rule_file.read_text()
+        except FileNotFoundError:
             self.errors.append(f"File not found: {rule_file}")
             return self.errors, self.warnings
         
-        content = rule_file.read_text()
-        
         # Validate metadata
         metadata = self._extract_metadata(content)
         if metadata:
@@ -78,7 +132,7 @@ class RuleValidator:
             if end_marker != -1:
                 yaml_content = content[3:end_marker]
                 try:
-                    return yaml.safe_load(yaml_content)
+                    return yaml.load(yaml_content, Loader=_YamlLoader)
                 except yaml.YAMLError as e:
                     self.errors.append(f"Invalid YAML metadata: {e}")
         return None
@@ -124,56 +178,65 @@ class RuleValidator:
     
     def _validate_content_structure(self, content: str):
         """Validate the content follows the required structure."""
-        required_sections = self.content_schema.get('required_sections', [])
-        
-        for section in required_sections:
-            if f"## {section}" not in content:
+        # Plain substring tests: CPython's string search is fast enough that a
+        # combined single-pass regex over the content measured slower
+        for section, heading in self._section_headings:
+            if heading not in content:
                 self.errors.append(f"Missing required section: {section}")
         
         # Check for proper section formatting
         if "## MUST_FOLLOW" in content and "### MUST_FOLLOW" not in content:
-            if not re.search(r'\*\*\[REQ\d+\]\*\*', content):
+            if not _REQ_ID_RE.search(content):
                 self.warnings.append("MUST_FOLLOW section should use REQ### format")
         
         if "## MUST_NOT_DO" in content and "### MUST_NOT_DO" not in content:
-            if not re.search(r'\*\*\[ANT\d+\]\*\*', content):
+            if not _ANT_ID_RE.search(content):
                 self.warnings.append("MUST_NOT_DO section should use ANT### format")
     
     def _validate_extraction_markers(self, content: str):
         """Validate extraction markers are properly formatted."""
-        markers = re.findall(r'<!-- EXTRACT:(\w+):(start|end) -->', content)
+        # Most rules have no markers; a plain substring test rules that out
+        # faster than running the marker regex over the whole file
+        if '<!-- EXTRACT:' not in content:
+            return
         
-        start_markers = {m[0] for m in markers if m[1] == 'start'}
-        end_markers = {m[0] for m in markers if m[1] == 'end'}
+        # Single pass: +1 per start and -1 per end, so any residue is unmatched
+        balance: Dict[str, int] = {}
+        started: Dict[str, None] = {}  # names with a start marker, in order
+        for marker, kind in _EXTRACT_MARKER_RE.findall(content):
+            if kind == 'start':
+                balance[marker] = balance.get(marker, 0) + 1
+                started[marker] = None
+            else:
+                balance[marker] = balance.get(marker, 0) - 1
         
         # Check for matching start/end markers
-        for marker in start_markers:
-            if marker not in end_markers:
+        for marker, count in balance.items():
+            if count > 0:
                 self.errors.append(f"Missing end marker for EXTRACT:{marker}")
         
-        for marker in end_markers:
-            if marker not in start_markers:
+        for marker, count in balance.items():
+            if count < 0:
                 self.errors.append(f"Missing start marker for EXTRACT:{marker}")
         
         # Check for standard marker names
-        standard_names = {'requirements', 'antipatterns', 'patterns', 'metrics'}
-        for marker in start_markers:
-            if marker not in standard_names:
+        for marker in started:
+            if marker not in _STANDARD_MARKERS:
                 self.warnings.append(f"Non-standard extraction marker: {marker}")
     
     def _validate_id_formats(self, content: str):
         """Validate ID formats throughout the content."""
         # Check REQ IDs
-        req_ids = re.findall(r'\*\*\[(REQ\d+)\]\*\*', content)
+        req_ids = _REQ_ID_RE.findall(content)
         self._check_sequential_ids(req_ids, 'REQ')
         
         # Check ANT IDs
-        ant_ids = re.findall(r'\*\*\[(ANT\d+)\]\*\*', content)
+        ant_ids = _ANT_ID_RE.findall(content)
         self._check_sequential_ids(ant_ids, 'ANT')
         
         # Check example naming
-        good_examples = re.findall(r'### (GOOD_EXAMPLE_\d+)', content)
-        bad_examples = re.findall(r'### (BAD_EXAMPLE_\d+)', content)
+        good_examples = _GOOD_EXAMPLE_RE.findall(content)
+        bad_examples = _BAD_EXAMPLE_RE.findall(content)
         
         if len(good_examples) < 2:
             self.warnings.append("Should have at least 2 GOOD_EXAMPLE sections")
@@ -185,13 +248,8 @@ class RuleValidator:
         if not ids:
             return
         
-        numbers = []
-        for id_str in ids:
-            match = re.match(f'{prefix}(\\d+)', id_str)
-            if match:
-                numbers.append(int(match.group(1)))
-        
-        numbers.sort()
+        # ids come from the REQ/ANT patterns, so everything after the prefix is digits
+        numbers = sorted(int(id_str[len(prefix):]) for id_str in ids)
         for i, num in enumerate(numbers, 1):
             if num != i:
                 self.warnings.append(f"{prefix} IDs are not sequential. Expected {prefix}{i:03d}, found {prefix}{num:03d}")
@@ -202,15 +260,11 @@ class RuleValidator:
         content = rule_file.read_text()
         original = content
         
-        # Fix ID formatting (REQ1 -> REQ001)
-        content = re.sub(r'\*\*\[REQ(\d)\]\*\*', lambda m: f'**[REQ00{m.group(1)}]**', content)
-        content = re.sub(r'\*\*\[REQ(\d\d)\]\*\*', lambda m: f'**[REQ0{m.group(1)}]**', content)
-        content = re.sub(r'\*\*\[ANT(\d)\]\*\*', lambda m: f'**[ANT00{m.group(1)}]**', content)
-        content = re.sub(r'\*\*\[ANT(\d\d)\]\*\*', lambda m: f'**[ANT0{m.group(1)}]**', content)
+        # Fix ID formatting (REQ1 -> REQ001, ANT12 -> ANT012)
+        content = _SHORT_ID_RE.sub(lambda m: m[1] + m[2].zfill(3), content)
         
-        # Fix example naming
-        content = re.sub(r'### Good Example (\d)', lambda m: f'### GOOD_EXAMPLE_00{m.group(1)}', content)
-        content = re.sub(r'### Bad Example (\d)', lambda m: f'### BAD_EXAMPLE_00{m.group(1)}', content)
+        # Fix example naming (Good Example 1 -> GOOD_EXAMPLE_001)
+        content = _LOOSE_EXAMPLE_RE.sub(lambda m: f'### {m[1].upper()}_EXAMPLE_00{m[2]}', content)
         
         # Add missing extraction markers
         if '## MUST_FOLLOW' in content and '<!-- EXTRACT:requirements:start -->' not in content:
@@ -219,7 +273,7 @@ class RuleValidator:
                 '### MUST_FOLLOW\n<!-- EXTRACT:requirements:start -->\n'
             )
             # Find the end of MUST_FOLLOW section
-            next_section = re.search(r'\n### (?!MUST_FOLLOW)', content)
+            next_section = _NEXT_SUBSECTION_RE.search(content)
             if next_section:
                 content = content[:next_section.start()] + '<!-- EXTRACT:requirements:end -->\n' + content[next_section.start():]
         
@@ -229,17 +283,94 @@ class RuleValidator:
         return False
 
 
-def validate_all_rules():
-    """Validate all rule files in the rules directory."""
+def _validator_cache_file() -> Path:
+    """Location of the `--all` result cache, next to the extractor's output cache."""
+    cache_dir = Path(os.environ.get('XDG_CACHE_HOME', '~/.cache')).expanduser() / 'workflow-tools'
+    return cache_dir / 'validator-cache.json'
+
+
+def _validator_stamp(schema_dir: Path) -> str:
+    """Identify the validator code and schemas; changing either invalidates cached results."""
+    stamps = [Path(__file__).stat().st_mtime_ns]
+    for name in ('rule-schema.json', 'rule-content-schema.yaml'):
+        try:
+            stamps.append((schema_dir / name).stat().st_mtime_ns)
+        except FileNotFoundError:
+            stamps.append(0)
+    return ':'.join(map(str, stamps))
+
+
+def _load_validator_cache(stamp: str) -> Dict[str, Dict]:
+    """Cached results by rule path; empty if missing, corrupt or from another validator."""
+    try:
+        data = json.loads(_validator_cache_file().read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('stamp') != stamp:
+        return {}
+    return data.get('files', {})
+
+
+def _save_validator_cache(stamp: str, files: Dict[str, Dict]):
+    """Write the result cache atomically; an unwritable cache directory is ignored."""
+    cache_file = _validator_cache_file()
+    tmp_file = cache_file.with_name(f'{cache_file.name}.{os.getpid()}.tmp')
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_text(json.dumps({'stamp': stamp, 'files': files}))
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+
+def _validate_one(rule_file: Path) -> Tuple[List[str], List[str]]:
+    """Validate a single rule file in a worker process."""
+    return RuleValidator().validate_file(rule_file)
+
+
+def validate_all_rules(use_cache: bool = True):
+    """Validate all rule files in the rules directory.
+    
+    Files whose mtime and size match the result cache are not re-validated;
+    large batches of changed files are validated in parallel.
+    """
     rules_dir = Path(__file__).parent.parent
     rule_files = list(rules_dir.glob('**/*.md'))
-    rule_files = [f for f in rule_files if not any(p in f.parts for p in ['templates', 'tools', 'schemas'])]
+    rule_files = sorted(f for f in rule_files if not any(p in f.parts for p in ['templates', 'tools', 'schemas']))
     
     validator = RuleValidator()
-    all_valid = True
+    stamp = _validator_stamp(validator.schema_dir)
+    cached = _load_validator_cache(stamp) if use_cache else {}
+    results = {}
+    pending = []
+    pending_bytes = 0
+    
+    for rule_file in rule_files:
+        stat = rule_file.stat()
+        entry = cached.get(str(rule_file))
+        if entry is None or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+            pending.append(rule_file)
+            pending_bytes += stat.st_size
+        results[str(rule_file)] = entry
     
-    for rule_file in sorted(rule_files):
-        errors, warnings = validator.validate_file(rule_file)
+    # Each file is independent, so big batches spread across processes
+    if len(pending) > 1 and (os.cpu_count() or 1) > 1 and pending_bytes >= _PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor() as executor:
+            outcomes = executor.map(_validate_one, pending, chunksize=8)
+            for rule_file, (errors, warnings) in zip(pending, outcomes):
+                results[str(rule_file)].update(errors=errors, warnings=warnings)
+    else:
+        for rule_file in pending:
+            errors, warnings = validator.validate_file(rule_file)
+            results[str(rule_file)].update(errors=errors, warnings=warnings)
+    
+    all_valid = True
+    for rule_file in rule_files:
+        entry = results[str(rule_file)]
+        errors, warnings = entry['errors'], entry['warnings']
         
         if errors or warnings:
             all_valid = False
@@ -254,6 +385,10 @@ def validate_all_rules():
     else:
         print(f"\n❌ Validation completed with issues")
     
+    # Rewritten from this run only, so deleted rules drop out of the cache
+    if use_cache:
+        _save_validator_cache(stamp, results)
+    
     return all_valid
 
 
@@ -264,7 +399,7 @@ def main():
         sys.exit(1)
     
     if sys.argv[1] == '--all':
-        success = validate_all_rules()
+        success = validate_all_rules(use_cache='--no-cache' not in sys.argv[2:])
         sys.exit(0 if success else 1)
     
     fix_mode = False